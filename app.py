@@ -1,56 +1,72 @@
+import logging
+import os
+import shelve
+import threading
 import dash
-from dash import dcc, html
+from dash import dcc, html, dash_table
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import yfinance as yf
-from datetime import datetime, time
-from dash.dependencies import Input, Output
-from collections import defaultdict  # For aggregating qty
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from time import monotonic, time as wall_time
+from dash.dash_table.Format import Format, Scheme
+from dash.dependencies import Input, Output, State
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 app = dash.Dash(__name__)
 
-# Load your P/L summary (optional)
-try:
-    grouped = pd.read_csv('portfolio_summary.csv')
-except FileNotFoundError:
-    grouped = pd.DataFrame({
-        'Ticker': ['ADANIPOWER', 'HDFCBANK', 'INFY'],
-        'Allocation %': [32.2, 25.0, 12.5],
-        'Returns %': [5.0, 3.2, 4.5]
-    })
+HOLDINGS_CSV = 'holdings.csv'
 
-# Load holdings from CSV for qty and avg price
-def load_holdings():
+# Load holdings from CSV for qty and avg price; cached until the file's mtime changes.
+# Returns None if the file is missing or unusable.
+@lru_cache(maxsize=1)
+def _load_holdings_for_mtime(mtime):
     try:
-        holdings_df = pd.read_csv('holdings.csv')
-        print("CSV Columns:", holdings_df.columns.tolist())  # Debug
-        print("First few rows:\n", holdings_df.head())  # Debug
-        # Aggregate: Sum quantity per ticker (only 'Buy' types)
-        agg_data = defaultdict(lambda: {'total_qty': 0, 'total_cost': 0})
-        for _, row in holdings_df.iterrows():
-            if row['type'] == 'Buy':  # Filter buys
-                ticker = str(row['ticker'])
-                qty = row['quantity']
-                avg_price = row['avg_price']
-                agg_data[ticker]['total_qty'] += qty
-                agg_data[ticker]['total_cost'] += qty * avg_price
-        tickers = []
-        holdings = {}
-        for ticker, data in agg_data.items():
-            if data['total_qty'] > 0:
-                total_qty = data['total_qty']
-                avg_price = data['total_cost'] / total_qty if total_qty > 0 else 0
-                tickers.append(ticker)
-                holdings[ticker] = {'qty': total_qty, 'avg_price': avg_price}
-        print("Loaded holdings:", holdings)  # Debug
+        # Arrow-backed columns: typed parse in C++ and compact string storage for tickers
+        holdings_df = pd.read_csv(HOLDINGS_CSV, usecols=['ticker', 'type', 'quantity', 'avg_price'],
+                                  engine='pyarrow', dtype_backend='pyarrow')
+        logger.debug("CSV Columns: %s", holdings_df.columns.tolist())
+        # Aggregate: Sum quantity and cost per ticker (only 'Buy' types) into two
+        # arrays indexed by factorized ticker codes (first-appearance order)
+        buys = holdings_df[holdings_df['type'].eq('Buy').fillna(False)]  # Arrow compares null as <NA>
+        codes, uniques = pd.factorize(buys['ticker'].to_numpy())
+        qty = np.nan_to_num(buys['quantity'].to_numpy(dtype=np.float64, na_value=np.nan))
+        cost = np.nan_to_num(qty * buys['avg_price'].to_numpy(dtype=np.float64, na_value=np.nan))
+        valid = codes >= 0  # Blank tickers factorize to -1
+        total_qty = np.zeros(len(uniques))
+        total_cost = np.zeros(len(uniques))
+        np.add.at(total_qty, codes[valid], qty[valid])
+        np.add.at(total_cost, codes[valid], cost[valid])
+        keep = total_qty > 0
+        avg_price = total_cost[keep] / total_qty[keep]
+        tickers = [str(t) for t in uniques[keep]]
+        holdings = {t: {'qty': q, 'avg_price': a} for t, q, a in zip(tickers, total_qty[keep].tolist(), avg_price.tolist())}
+        logger.debug("Loaded holdings: %s", holdings)
         if not tickers:
             raise ValueError("No valid buys in CSV.")
         return tickers, holdings
     except FileNotFoundError:
-        print("holdings.csv not found. Using sample data.")
+        logger.warning("holdings.csv not found.")
     except Exception as e:
-        print(f"CSV issue: {e}. Using sample data.")
-    # Sample fallback
+        logger.warning("CSV issue: %s", e)
+    return None
+
+def load_holdings():
+    """Return (tickers, holdings), reparsing holdings.csv only when it has been modified (None if unusable)."""
+    try:
+        mtime = os.path.getmtime(HOLDINGS_CSV)
+    except OSError:
+        mtime = None  # Missing file: the failed load is cached under None
+    return _load_holdings_for_mtime(mtime)
+
+def _sample_holdings():
+    """Sample portfolio, used only when there is no usable holdings.csv at startup."""
     tickers = ['ADANIPOWER.NS', 'HDFCBANK.NS', 'INFY.NS']
     holdings = {
         'ADANIPOWER.NS': {'qty': 50, 'avg_price': 250.0},
@@ -59,87 +75,228 @@ def load_holdings():
     }
     return tickers, holdings
 
-tickers, holdings = load_holdings()
+_holdings_version = 0  # Bumped on every (re)load so clients know to re-render
+
+def _set_holdings(new_tickers, new_holdings):
+    """Install a loaded portfolio and precompute its per-holding arrays once."""
+    global tickers, holdings, _TICKERS_ARR, _QTY, _AVG, _INVESTED, _DISPLAY_TICKERS, _holdings_version
+    tickers, holdings = new_tickers, new_holdings
+    _holdings_version += 1
+    _TICKERS_ARR = np.array(tickers)
+    _QTY = np.array([holdings[t]['qty'] for t in tickers], dtype=np.float64)
+    _AVG = np.array([holdings[t]['avg_price'] for t in tickers], dtype=np.float64)
+    _INVESTED = _QTY * _AVG
+    _DISPLAY_TICKERS = np.char.replace(_TICKERS_ARR, '.NS', '')
+
+_loaded = load_holdings()
+if _loaded is None:
+    logger.warning("Using sample data.")
+    _loaded = _sample_holdings()
+_set_holdings(*_loaded)
+
+# TTL caches for yfinance responses: key -> (fetched_at, value). Entries are
+# mirrored to a shelve file so a restarted server starts warm.
+_price_cache = {}  # (tickers, period, interval[, session]) -> {ticker: price}
+_trend_cache = {}  # (tickers, '1mo', '1d', session) -> trend figure dict
+
+LIVE_PRICE_TTL = 20  # seconds, 1m bars while market is open
+CLOSED_PRICE_TTL = 6 * 60 * 60  # last 1d close barely changes once market shuts
+TREND_TTL_OPEN = 60 * 60  # Daily bars: the trend only moves with today's close
+TREND_TTL_CLOSED = 12 * 60 * 60
+YF_BATCH_SIZE = 20  # Yahoo caps symbols per download URL
+# Shared yf.download options: no progress bar on stdout, no dividend/split columns
+YF_DOWNLOAD_KWARGS = {'progress': False, 'actions': False, 'auto_adjust': False, 'rounding': False, 'threads': True}
+CACHE_PATH = 'yf_cache'
+DISK_CACHE_MIN_TTL = 30  # seconds (one open-market tick); shorter-lived entries stay in memory only
+# Serializes shelve access between this process's threads. The default dbm.dumb
+# backend is not safe for concurrent writers, so one server process owns the file.
+_cache_lock = threading.Lock()
+
+def _disk_load(key):
+    """Return (monotonic fetched_at, value) for key from the on-disk cache, or None."""
+    try:
+        with _cache_lock, shelve.open(CACHE_PATH) as db:
+            stored = db.get(repr(key))
+    except Exception as e:  # A broken cache file must never break pricing
+        logger.debug("Disk cache read failed: %s", e)
+        return None
+    if stored is None:
+        return None
+    wall_ts, value = stored
+    return monotonic() - (wall_time() - wall_ts), value
+
+def _disk_store(key, value):
+    try:
+        with _cache_lock, shelve.open(CACHE_PATH) as db:
+            db[repr(key)] = (wall_time(), value)
+    except Exception as e:
+        logger.debug("Disk cache write failed: %s", e)
+
+def _cached_download(key, ttl_seconds, fetch_fn, cache=_price_cache):
+    """Return cache[key] if younger than ttl_seconds, else call fetch_fn and store it."""
+    persist = ttl_seconds >= DISK_CACHE_MIN_TTL
+    hit = cache.get(key)
+    if hit is None and persist:
+        hit = _disk_load(key)  # Cold key: warm from a previous run
+        if hit is not None:
+            cache[key] = hit
+    if hit is not None and monotonic() - hit[0] < ttl_seconds:
+        return hit[1]
+    value = fetch_fn()
+    if value is not None and len(value) > 0:  # Don't pin empty/failed responses
+        cache[key] = (monotonic(), value)
+        if persist:
+            _disk_store(key, value)
+    return value
+
+MARKET_OPEN_MIN = 9 * 60 + 15  # 09:15 as minutes since midnight
+MARKET_CLOSE_MIN = 15 * 60 + 30  # 15:30
 
-def is_market_open():
-    """Check NSE hours (Mon-Fri, 9:15-15:30 IST)."""
-    now = datetime.now()
-    return now.weekday() < 5 and time(9, 15) <= now.time() <= time(15, 30)
+IST = ZoneInfo('Asia/Kolkata')  # Market hours are IST whatever the server's timezone
 
-def fetch_live_prices(tickers):
+def is_market_open(now=None):
+    """Check NSE hours (Mon-Fri, 9:15-15:30 IST). now must be an IST datetime."""
+    now = now or datetime.now(IST)
+    return now.weekday() < 5 and MARKET_OPEN_MIN <= now.hour * 60 + now.minute <= MARKET_CLOSE_MIN
+
+def _last_session_date(now=None):
+    """Date of the most recent weekday session that has closed (exchange holidays aren't tracked)."""
+    now = now or datetime.now(IST)
+    day = now.date()
+    if now.hour * 60 + now.minute <= MARKET_CLOSE_MIN:  # Today's session hasn't closed yet
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+def _cache_session(market_open):
+    """Cache-key component: 'live' intraday, else the last closed session's date,
+    so closed-market entries roll over at each close instead of outliving it."""
+    return 'live' if market_open else _last_session_date()
+
+def _download_latest_close(tickers, period, interval):
+    """Batch-download tickers in chunks of YF_BATCH_SIZE and return {ticker: latest close}."""
+    prices = {}
+    for chunk in [tickers[i:i + YF_BATCH_SIZE] for i in range(0, len(tickers), YF_BATCH_SIZE)]:
+        # No session=: yfinance keeps one pooled curl_cffi session for the process
+        # and rejects plain requests sessions, so connections are already reused.
+        try:
+            data = yf.download(chunk, period=period, interval=interval, group_by='ticker', prepost=True,
+                               **YF_DOWNLOAD_KWARGS)
+            if data.empty:
+                continue
+            if isinstance(data.columns, pd.MultiIndex):
+                closes = data.xs('Close', level=1, axis=1)
+            else:  # Older yfinance returns flat columns for a single ticker
+                closes = data[['Close']].set_axis(chunk, axis=1)
+            latest_close = closes.ffill().iloc[-1].dropna()
+        except Exception as e:  # Keep earlier chunks; callers refetch what's missing
+            logger.warning("Fetch error for chunk %s (%s): %s", chunk, interval, e)
+            continue
+        prices.update({t: latest_close[t] for t in chunk if t in latest_close.index})
+    return prices
+
+def fetch_live_prices(tickers, market_open=None):
     """Fetch latest prices with robust error handling, prioritizing live data."""
     if not tickers:
         return {}
+    if market_open is None:
+        market_open = is_market_open()
     prices = {}
-    print(f"Attempting to fetch prices for tickers: {tickers}")
+    logger.debug("Attempting to fetch prices for tickers: %s", tickers)
+    key = tuple(sorted(tickers))
     try:
-        # Try 1-day with 1-minute interval for live data
-        data = yf.download(tickers, period='1d', interval='1m', auto_adjust=False, prepost=True)
-        print(f"Raw data from yf.download (1m): {data}")
-        if not data.empty:
-            latest_close = data['Close'].iloc[-1]
-            print(f"Latest close values (1m): {latest_close}")
-            for ticker in tickers:
-                if ticker in latest_close.index:
-                    prices[ticker] = latest_close[ticker]
-        if not prices:  # Fallback to 2d if 1m fails
-            data = yf.download(tickers, period='2d', interval='1d', auto_adjust=False, prepost=True)
-            print(f"Raw data from yf.download (2d): {data}")
-            if not data.empty:
-                latest_close = data['Close'].iloc[-1]
-                print(f"Latest close values (2d): {latest_close}")
-                for ticker in tickers:
-                    if ticker in latest_close.index:
-                        prices[ticker] = latest_close[ticker]
-            else:
-                raise Exception("No data from 2d fetch")
+        if market_open:  # No new 1m bars outside market hours, so don't ask for them
+            # Try 1-day with 1-minute interval for live data
+            prices.update(_cached_download((key, '1d', '1m'), LIVE_PRICE_TTL,
+                                           lambda: _download_latest_close(tickers, '1d', '1m')))
+        missing = [t for t in tickers if t not in prices]
+        if missing:  # Last daily close (batched): market closed, or the 1m fetch missed them
+            # Intraday the daily bar is still moving, so it gets the live TTL and a
+            # 'live' key that the closed-market path never reads
+            ttl = LIVE_PRICE_TTL if market_open else CLOSED_PRICE_TTL
+            prices.update(_cached_download((tuple(sorted(missing)), '2d', '1d', _cache_session(market_open)), ttl,
+                                           lambda: _download_latest_close(missing, '2d', '1d')))
     except Exception as e:
-        print(f"Fetch error for all tickers: {e}")
-        for ticker in tickers:
-            try:
-                ticker_data = yf.download(ticker, period='1d', interval='1m', auto_adjust=False, prepost=True)
-                print(f"Individual data for {ticker} (1m): {ticker_data}")
-                if not ticker_data.empty:
-                    prices[ticker] = ticker_data['Close'].iloc[-1]
-                else:
-                    ticker_data = yf.download(ticker, period='2d', interval='1d', auto_adjust=False, prepost=True)
-                    print(f"Individual data for {ticker} (2d): {ticker_data}")
-                    if not ticker_data.empty:
-                        prices[ticker] = ticker_data['Close'].iloc[-1]
-                    else:
-                        prices[ticker] = holdings.get(ticker, {'avg_price': 0})['avg_price']
-            except Exception as te:
-                print(f"Fetch error for {ticker}: {te}")
-                prices[ticker] = holdings.get(ticker, {'avg_price': 0})['avg_price']
-    print(f"Fetched prices: {prices}")
+        logger.warning("Fetch error for all tickers: %s", e)
+    for ticker in tickers:
+        if ticker not in prices:  # Last resort: value the holding at cost
+            prices[ticker] = holdings.get(ticker, {'avg_price': 0})['avg_price']
+    logger.debug("Fetched prices: %s", prices)
     return prices
-def build_holdings_df(tickers, holdings):
+
+def _trend_figure(tickers):
+    """Download 1-month daily Close per ticker and build the trend figure dict (None if no data)."""
+    multi_data = yf.download(tickers, period='1mo', interval='1d', **YF_DOWNLOAD_KWARGS)['Close']
+    if multi_data.empty:
+        return None
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Trend data:\n%s", multi_data.head())
+    return px.line(multi_data, title='1-Month Performance Trend').to_dict()
+
+def _get_trend(tickers, market_open):
+    """Return (trend figure dict, token), cached for hours so ticks skip both the download and px.line.
+
+    The token (the cache entry's fetch time) changes only when the figure is refetched.
+    """
+    ttl = TREND_TTL_OPEN if market_open else TREND_TTL_CLOSED
+    key = (tuple(sorted(tickers)), '1mo', '1d', _cache_session(market_open))
+    fig = _cached_download(key, ttl, lambda: _trend_figure(tickers), cache=_trend_cache)
+    hit = _trend_cache.get(key)
+    return fig, (hit[0] if hit is not None and hit[1] is fig else None)
+
+def build_holdings_df(prices):
     """Build table data with live LTP, handling invalid prices."""
-    prices = fetch_live_prices(tickers)
-    df_data = []
-    for ticker in tickers:
-        if ticker in holdings:
-            h = holdings[ticker]
-            ltp = prices.get(ticker)
-            if not isinstance(ltp, (int, float)) or pd.isna(ltp):
-                ltp = h['avg_price']
-            value = h['qty'] * ltp
-            pct_chg = ((ltp - h['avg_price']) / h['avg_price']) * 100 if h['avg_price'] > 0 else 0
-            unrealized = value - (h['qty'] * h['avg_price'])
-            df_data.append([
-                ticker.replace('.NS', ''),
-                h['qty'],
-                f"{h['avg_price']:.2f}",
-                f"{ltp:.2f}",
-                pct_chg,  # Store as float, not formatted string
-                f"{value:.2f}",
-                f"{unrealized:.2f}"
-            ])
-    df = pd.DataFrame(df_data, columns=['Ticker', 'Net Qty', 'Avg Price', 'LTP', '%Chg', 'Value', 'Unrealized'])
-    df['%Chg'] = df['%Chg'].round(2)  # Ensure %Chg is numeric
-    return df.sort_values('Value', ascending=False) if not df.empty else pd.DataFrame()
-
-# Callback for auto-refresh: Updates every 30s
+    if not tickers:
+        return pd.DataFrame()
+    ltp = np.array([prices.get(t) for t in tickers], dtype=np.float64)  # None -> NaN
+    ltp = np.where(np.isnan(ltp), _AVG, ltp)  # Missing/invalid price: fall back to avg
+    value = _QTY * ltp
+    pct_chg = np.divide((ltp - _AVG) * 100, _AVG, out=np.zeros_like(_AVG), where=_AVG > 0)
+    df = pd.DataFrame({
+        'Ticker': _DISPLAY_TICKERS,
+        'Net Qty': _QTY,
+        'Avg Price': _AVG,
+        'LTP': ltp,
+        '%Chg': pct_chg.round(2),
+        'Value': value,
+        'Unrealized': value - _INVESTED,
+    })
+    return df.sort_values('Value', ascending=False)
+
+# Holdings table columns never change, so build the spec once. Numbers stay
+# floats in the DataFrame; the table formats them to 2 decimals client-side.
+_MONEY = Format(precision=2, scheme=Scheme.fixed)
+TABLE_COLUMNS = [{'name': 'Ticker', 'id': 'Ticker'}, {'name': 'Net Qty', 'id': 'Net Qty', 'type': 'numeric'}] + [
+    {'name': c, 'id': c, 'type': 'numeric', 'format': _MONEY} for c in ['Avg Price', 'LTP', '%Chg', 'Value', 'Unrealized']
+]
+
+# Pie/bar figure dicts from the latest render, keyed by the prices they were
+# built from, so a page load at unchanged prices reuses them
+_fig_cache = {}  # name -> (prices, figure dict)
+
+def _cached_figure(name, prices, build_fn):
+    """Return the figure dict built for these prices, rebuilding it only when prices change."""
+    hit = _fig_cache.get(name)
+    if hit is not None and hit[0] == prices:
+        return hit[1]
+    fig = build_fn().to_dict()  # Dash accepts plain dicts as figures
+    _fig_cache[name] = (prices, fig)
+    return fig
+
+# What each browser tab last rendered lives in its own dcc.Store ('render-state'):
+# {'prices': {ticker: price}, 'trend': trend token, 'holdings': _holdings_version,
+#  'updated_at': wall-clock time of the last full or timestamp-only refresh}
+CLOSED_REFRESH_SECONDS = 60 * 60  # Re-render at most hourly while market is closed
+OPEN_INTERVAL_MS = 30 * 1000
+CLOSED_INTERVAL_MS = 15 * 60 * 1000
+
+def _timestamp_div(market_open, now):
+    status = " (Live Market)" if market_open else " (Market Closed - Last Close)"
+    cadence = "30s" if market_open else "15 min"
+    return html.Div(f"Updated: {now.strftime('%Y-%m-%d %H:%M:%S')}{status} | Auto-refreshes every {cadence}", style={'textAlign': 'center', 'color': 'gray', 'marginTop': '20px'})
+
+# Callback for auto-refresh: 30s while open, 15 min when closed (interval set client-side below)
 @app.callback(
     [
         Output('holdings-table', 'children'),
@@ -147,40 +304,78 @@ def build_holdings_df(tickers, holdings):
         Output('returns-bar', 'figure'),
         Output('trend-line', 'figure'),
         Output('timestamp', 'children'),
-        Output('summary', 'children')
+        Output('summary', 'children'),
+        Output('render-state', 'data')
     ],
-    [Input('interval-component', 'n_intervals')]
+    [Input('interval-component', 'n_intervals')],
+    [State('render-state', 'data')]
 )
-def update_dashboard(n):
-    print(f"Callback triggered at {datetime.now().strftime('%H:%M:%S')} with n={n}")
+def update_dashboard(n, state):
+    logger.debug("Callback triggered with n=%s", n)
+    loaded = load_holdings()
+    # holdings.csv was edited: reload (the version bump forces a full render in
+    # every tab). A bad edit (None) keeps the current holdings rather than
+    # swapping in sample data.
+    if loaded is not None and loaded[0] is not tickers:
+        logger.info("holdings.csv changed, reloading holdings")
+        _set_holdings(*loaded)
+        _fig_cache.clear()  # Figures were built for the old holdings
+    # n == 0 is a fresh page load, and a tab rendered against older holdings is stale:
+    # both need a full render
+    if not n or not state or state.get('holdings') != _holdings_version:
+        state = None
+    now = datetime.now(IST)  # One clock read per tick for market state and timestamp
+    market_open = is_market_open(now)
+    if state and not market_open and wall_time() - state['updated_at'] < CLOSED_REFRESH_SECONDS:
+        # Market closed and this tab rendered recently: only the timestamp needs refreshing
+        return dash.no_update, dash.no_update, dash.no_update, dash.no_update, _timestamp_div(market_open, now), dash.no_update, dash.no_update
     try:
-        df = build_holdings_df(tickers, holdings)
-        print(f"DataFrame: {df.head() if not df.empty else 'Empty'}")
-        fig_pie_live = px.pie(df, values='Value', names='Ticker', title='Allocation %') if not df.empty else px.pie()
-        fig_bar_live = px.bar(df, x='Ticker', y='%Chg', title='Returns % per Stock') if not df.empty else px.bar()
-        try:
-            multi_data = yf.download(tickers, period='1mo')['Close']
-            print(f"Trend data: {multi_data.head() if not multi_data.empty else 'Empty'}")
-            fig_trend_live = px.line(multi_data, title='1-Month Performance Trend') if not multi_data.empty else px.line(title='1-Month Performance Trend (Data unavailable)')
-        except Exception as e:
-            print(f"Trend fetch error: {e}")
+        # Prices and trend are independent network calls; fetch them concurrently
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            prices_future = ex.submit(fetch_live_prices, tickers, market_open)
+            trend_future = ex.submit(_get_trend, tickers, market_open)
+            prices = prices_future.result()
+            try:
+                fig_trend_live, trend_token = trend_future.result()
+            except Exception as e:
+                logger.warning("Trend fetch error: %s", e)
+                fig_trend_live, trend_token = None, None
+        new_state = {
+            'prices': {t: float(p) for t, p in prices.items()},  # JSON-safe for the Store
+            'trend': trend_token,
+            'holdings': _holdings_version,
+            'updated_at': wall_time(),
+        }
+        if state and new_state['prices'] == state['prices'] and trend_token == state['trend']:
+            # Nothing moved since this tab's last render: only the timestamp needs refreshing
+            return dash.no_update, dash.no_update, dash.no_update, dash.no_update, _timestamp_div(market_open, now), dash.no_update, new_state
+        df = build_holdings_df(prices)
+        fig_pie_live = _cached_figure('pie', prices, lambda: px.pie(df, values='Value', names='Ticker', title='Allocation %')) if not df.empty else px.pie()
+        fig_bar_live = _cached_figure('bar', prices, lambda: px.bar(df, x='Ticker', y='%Chg', title='Returns % per Stock')) if not df.empty else px.bar()
+        if logger.isEnabledFor(logging.DEBUG):  # Skip DataFrame repr unless debugging
+            logger.debug("DataFrame:\n%s", df.head())
+        if fig_trend_live is None:
             fig_trend_live = px.line(title='1-Month Performance Trend (Data unavailable)')
         if not df.empty:
-            table_rows = [html.Tr([html.Td(str(col)) for col in row]) for row in df.itertuples(index=False, name=None)]
-            table_header = html.Thead(html.Tr([html.Th(col) for col in df.columns]))
-            table = html.Table([table_header, html.Tbody(table_rows)], style={'width': '100%', 'border': '1px solid black'})
+            table = dash_table.DataTable(
+                id='holdings-table-inner',
+                data=df.to_dict('records'),
+                columns=TABLE_COLUMNS,
+                sort_action='native',
+                style_table={'width': '100%'},
+                style_cell={'border': '1px solid black', 'textAlign': 'left'},
+            )
         else:
             table = html.Div("No holdings data available. Check holdings.csv.")
-        status = " (Live Market)" if is_market_open() else " (Market Closed - Last Close)"
-        timestamp = html.Div(f"Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{status} | Auto-refreshes every 30s", style={'textAlign': 'center', 'color': 'gray', 'marginTop': '20px'})
+        timestamp = _timestamp_div(market_open, now)
         total_return = df['%Chg'].mean() if not df.empty else 0
-        total_value = pd.to_numeric(df['Value'], errors='coerce').sum() if not df.empty else 0
+        total_value = df['Value'].sum() if not df.empty else 0
         summary = html.P(f"Total Return: {total_return:.2f}% | Total Value: ₹{total_value:.2f}", style={'textAlign': 'center', 'color': 'navy', 'fontSize': '18px', 'marginTop': '10px'})
-        print("Returning data successfully")
-        return table, fig_pie_live, fig_bar_live, fig_trend_live, timestamp, summary
+        logger.debug("Returning data successfully")
+        return table, fig_pie_live, fig_bar_live, fig_trend_live, timestamp, summary, new_state
     except Exception as e:
-        print(f"Callback error: {e}")
-        return html.Div("Error updating dashboard. Check terminal logs."), px.pie(), px.bar(), px.line(), html.Div(), html.P()
+        logger.exception("Callback error: %s", e)
+        return html.Div("Error updating dashboard. Check terminal logs."), px.pie(), px.bar(), px.line(), html.Div(), html.P(), None
 app.layout = html.Div([
     html.H1("My Groww Portfolio Tracker", style={'textAlign': 'center', 'color': 'navy'}),
     
@@ -196,15 +391,44 @@ app.layout = html.Div([
     # 1-Month Trend (dynamic)
     dcc.Graph(id='trend-line'),
     
-    # Interval for 30s refresh
-    dcc.Interval(id='interval-component', interval=30*1000, n_intervals=0),
+    # Interval for refresh: 30s while open, 15 min when closed (set client-side below)
+    dcc.Interval(id='interval-component', interval=OPEN_INTERVAL_MS, n_intervals=0),
     
     # Timestamp (dynamic)
     html.Div(id='timestamp'),
     
     # Summary (dynamic)
-    html.Div(id='summary')
+    html.Div(id='summary'),
+    
+    # Per-tab record of the last render, used to skip redundant refreshes
+    dcc.Store(id='render-state')
 ])
 
+# Pick the refresh cadence in the browser so off-hours ticks never reach the server.
+# NSE hours are checked in IST regardless of the browser's timezone. A chart
+# interaction (zoom/pan) returns a slightly different interval, which makes
+# dcc.Interval restart its timer, so a refresh never lands mid-interaction.
+app.clientside_callback(
+    """
+    function(n, pieLayout, barLayout, trendLayout) {
+        const ist = new Date(Date.now() + 330 * 60000);
+        const day = ist.getUTCDay();
+        const mins = ist.getUTCHours() * 60 + ist.getUTCMinutes();
+        const open = day >= 1 && day <= 5 && mins >= %d && mins <= %d;
+        const base = open ? %d : %d;
+        const triggered = window.dash_clientside.callback_context.triggered.map(t => t.prop_id);
+        const interacting = triggered.some(id => id.endsWith('.relayoutData'));
+        return interacting ? base + (Date.now() %% 1000) + 1 : base;
+    }
+    """ % (MARKET_OPEN_MIN, MARKET_CLOSE_MIN, OPEN_INTERVAL_MS, CLOSED_INTERVAL_MS),
+    Output('interval-component', 'interval'),
+    [
+        Input('interval-component', 'n_intervals'),
+        Input('allocation-pie', 'relayoutData'),
+        Input('returns-bar', 'relayoutData'),
+        Input('trend-line', 'relayoutData')
+    ]
+)
+
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
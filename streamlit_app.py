@@ -217,12 +217,13 @@ st.sidebar.markdown(f"*Updated: {st.session_state.last_update.strftime('%H:%M:%S
 # ----------------------------------------------------------------------
 df, df_numeric, nifty_change = build_holdings_df(tickers, holdings)
 
-display_df = df.copy()
 fmt_cols = ['Avg Price', 'Live Price', 'Invested', 'Current Value', 'Unrealized P/L', '%Chg', 'Allocation %']
-for c in fmt_cols:
-    display_df[c] = display_df[c].apply(lambda x: f"{x:.2f}")
-
-st.dataframe(display_df, use_container_width=True)
+# Format in the browser instead of building a formatted string copy per cell
+st.dataframe(
+    df,
+    use_container_width=True,
+    column_config={c: st.column_config.NumberColumn(format="%.2f") for c in fmt_cols}
+)
 
 st.download_button(
     label="Download Portfolio as Excel",